@@ -40,6 +40,7 @@ pytest_plugins = [
     "saleor.shipping.tests.fixtures",
     "saleor.permission.tests.fixtures",
     "saleor.giftcard.tests.fixtures",
+    "saleor.hardware.tests.fixtures",
     "saleor.discount.tests.fixtures",
     "saleor.checkout.tests.fixtures",
     "saleor.attribute.tests.fixtures",
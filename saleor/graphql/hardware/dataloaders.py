@@ -0,0 +1,17 @@
+from collections import defaultdict
+
+from ...hardware.models import HardwareQuery
+from ..core.dataloaders import DataLoader
+
+
+class HardwareQueriesByChatIdLoader(DataLoader[int, list[HardwareQuery]]):
+    context_key = "hardware_queries_by_chat_id"
+
+    def batch_load(self, keys):
+        queries = HardwareQuery.objects.using(self.database_connection_name).filter(
+            chat_id__in=keys
+        )
+        queries_map = defaultdict(list)
+        for query in queries.iterator():
+            queries_map[query.chat_id].append(query)
+        return [queries_map.get(chat_id, []) for chat_id in keys]
@@ -1,25 +1,53 @@
+import logging
 import uuid
 
 import graphene
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
-
-from ...hardware.gemini_client import GeminiClient
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Substr
+
+from ...core.tracing import traced_atomic_transaction
+from ...hardware.gemini_client import (
+    GEMINI_TIMEOUT_MESSAGE,
+    IDENTIFY_ERROR_PREFIX,
+    PRODUCT_PROMPT_DESCRIPTION_LENGTH,
+    get_client,
+    run_sync,
+)
 from ...hardware.models import (
     HardwareChat,
     HardwareIdentification,
     HardwareQuery,
     ProductSimilaritySearch,
 )
+from ...hardware.search import product_embeddings_ready, search_products_by_component
+from ...hardware.tasks import identify_hardware_task
+from ...hardware.utils import save_uploaded_image
 from ...permission.enums import AppPermission, HardwarePermissions
 from ...product.models import Product
 from ..core.doc_category import DOC_CATEGORY_PRODUCTS
+from ..core.enums import JobStatusEnum
 from ..core.fields import BaseField
 from ..core.mutations import BaseMutation
 from ..core.scalars import DateTime
 from ..core.types import BaseInputObjectType, Upload
 from ..core.types.common import Error
+from ..core.utils import from_global_id_or_error
 from ..product.types import Product as ProductType
+from .dataloaders import HardwareQueriesByChatIdLoader
+
+logger = logging.getLogger(__name__)
+
+
+def get_products_in_order(product_ids):
+    """Return the products with the given IDs, in the order of the IDs."""
+    products = Product.objects.filter(id__in=product_ids)
+    products_by_id = {str(product.pk): product for product in products}
+    return [
+        products_by_id[str(product_id)]
+        for product_id in product_ids
+        if str(product_id) in products_by_id
+    ]
 
 
 class HardwareError(Error):
@@ -37,6 +65,7 @@ class HardwareIdentificationType(graphene.ObjectType):
     id = graphene.GlobalID(required=True)
     image = graphene.String()
     result = graphene.String()
+    status = JobStatusEnum(description="Status of the identification.")
     created_at = DateTime()
 
     class Meta:
@@ -67,7 +96,7 @@ class HardwareChatType(graphene.ObjectType):
         doc_category = DOC_CATEGORY_PRODUCTS
 
     def resolve_queries(self, info):
-        return HardwareQuery.objects.filter(chat_id=self.id)
+        return HardwareQueriesByChatIdLoader(info.context).load(self.id)
 
 
 class ProductSimilaritySearchType(graphene.ObjectType):
@@ -82,8 +111,7 @@ class ProductSimilaritySearchType(graphene.ObjectType):
         doc_category = DOC_CATEGORY_PRODUCTS
 
     def resolve_similar_products(self, info):
-        product_ids = self.similar_product_ids
-        return Product.objects.filter(id__in=product_ids)
+        return get_products_in_order(self.similar_product_ids)
 
 
 # Inputs
@@ -121,7 +149,10 @@ class IdentifyHardwareImage(BaseMutation):
         )
 
     class Meta:
-        description = "Identify hardware from an uploaded image."
+        description = (
+            "Identify hardware from an uploaded image. The identification is "
+            "processed asynchronously; query it by ID to get the result."
+        )
         doc_category = DOC_CATEGORY_PRODUCTS
         # permissions = (HardwarePermissions.CHAT,)
         error_type_class = HardwareError
@@ -131,19 +162,13 @@ class IdentifyHardwareImage(BaseMutation):
     def perform_mutation(cls, _root, info, /, *, image):
         # Save the uploaded file
         image_file = info.context.FILES[image]
-        image_name = f"{uuid.uuid4()}_{image_file.name}"
-        path = default_storage.save(f"hw/{image_name}", ContentFile(image_file.read()))
-
-        # Get the full path to the saved file
-        full_path = default_storage.path(path)
+        path, _full_path, digest = save_uploaded_image(image_file, "hw")
 
-        # Process with Gemini
-        client = GeminiClient()
-        result = client.identify_hardware_from_image(full_path)
-
-        # Store in database
-        identification = HardwareIdentification.objects.create(
-            image=path, result=result
+        # Store in database and identify the hardware in the background; clients
+        # poll the identification until its status changes
+        identification = HardwareIdentification.objects.create(image=path)
+        transaction.on_commit(
+            lambda: identify_hardware_task.delay(identification.pk, digest)
         )
 
         return IdentifyHardwareImage(identification=identification)
@@ -170,21 +195,21 @@ class HardwareChatMessage(BaseMutation):
         session_id = input.get("session_id")
         query = input.get("query")
 
-        client = GeminiClient()
+        client = get_client()
 
         if session_id:
-            print(f"Session ID: {session_id}")
             try:
                 chat_session = HardwareChat.objects.get(session_id=session_id)
                 history = chat_session.history
-                print(f"History: {history}")
             except HardwareChat.DoesNotExist:
-                print(f"Session ID {session_id} does not exist.")
-                print(HardwareChat.objects.all())
                 chat_session = HardwareChat.objects.create(
                     session_id=str(uuid.uuid4()), history=[]
                 )
-                print(f"Creating new session. f{chat_session.session_id}")
+                logger.debug(
+                    "Hardware chat session %s does not exist, created session %s.",
+                    session_id,
+                    chat_session.session_id,
+                )
                 history = []
         else:
             chat_session = HardwareChat.objects.create(
@@ -195,14 +220,14 @@ class HardwareChatMessage(BaseMutation):
         # Process the query with Gemini
         result = client.hardware_chat(query, history)
 
-        # Update the chat session history
-        chat_session.history = result["history"]
-        chat_session.save()
-
-        # Store the query and answer
-        HardwareQuery.objects.create(
-            chat=chat_session, question=query, answer=result["response"]
-        )
+        # Update the chat session history and store the query and answer in a
+        # single transaction
+        with traced_atomic_transaction():
+            chat_session.history = result["history"]
+            chat_session.save(update_fields=["history", "updated_at"])
+            HardwareQuery.objects.create(
+                chat=chat_session, question=query, answer=result["response"]
+            )
 
         return HardwareChatMessage(chat=chat_session, response=result["response"])
 
@@ -227,52 +252,86 @@ class FindSimilarProducts(BaseMutation):
         error_type_field = "hardware_errors"
 
     @classmethod
-    def perform_mutation(cls, _root, info, /, *, image, input):
-        image_file = info.context.FILES[image]
-        image_name = f"{uuid.uuid4()}.{image_file.name.split('.')[-1]}"
-        path = default_storage.save(
-            f"pss/{image_name}", ContentFile(image_file.read())
+    def find_similar_with_embeddings(
+        cls, client, full_path, digest, max_results, category_id
+    ):
+        try:
+            hardware_id_result = run_sync(
+                client.identify_hardware_from_image(full_path, digest)
+            )
+        except TimeoutError:
+            hardware_id_result = f"{IDENTIFY_ERROR_PREFIX}: {GEMINI_TIMEOUT_MESSAGE}"
+        product_ids = search_products_by_component(
+            client, hardware_id_result, max_results, category_id
         )
+        return hardware_id_result, [str(product_id) for product_id in product_ids]
 
-        # Get the full path to the saved file
-        full_path = default_storage.path(path)
-
-        category_id = input.get("category_id")
-        max_results = input.get("max_results", 3)
-
-        # Get products from the database
-        products_query = Product.objects.all()
+    @classmethod
+    def find_similar_with_prompt(
+        cls, client, full_path, digest, max_results, category_id
+    ):
+        # Get products from the database, truncating descriptions in SQL so the
+        # full text is never transferred
+        products_query = Product.objects.annotate(
+            category_name=Coalesce("category__name", Value("")),
+            short_description=Substr(
+                "description_plaintext", 1, PRODUCT_PROMPT_DESCRIPTION_LENGTH
+            ),
+        )
 
         if category_id:
             products_query = products_query.filter(category_id=category_id)
 
         # Convert products to a format suitable for Gemini
-        product_database = []
-        for product in products_query:
-            product_database.append(
-                {
-                    "id": str(product.id),  # type: ignore  # noqa: PGH003
-                    "name": product.name,
-                    "category": product.category.name if product.category else "",
-                    "description": product.description,
-                }
+        product_database = [
+            {
+                "id": str(product["id"]),
+                "name": product["name"],
+                "category": product["category_name"],
+                "description": product["short_description"],
+            }
+            for product in products_query.values(
+                "id", "name", "category_name", "short_description"
+            )
+        ]
+
+        # Upload the image once, then identify the hardware component and find
+        # similar products concurrently
+        try:
+            hardware_id_result, similar_products_data = run_sync(
+                client.identify_and_find_similar_products(
+                    full_path, product_database, digest
+                )
             )
+        except TimeoutError:
+            hardware_id_result = f"{IDENTIFY_ERROR_PREFIX}: {GEMINI_TIMEOUT_MESSAGE}"
+            similar_products_data = []
 
-        client = GeminiClient()
+        # Limit the number of results
+        similar_products_data = similar_products_data[:max_results]
 
-        # First identify the hardware component
-        hardware_id_result = client.identify_hardware_from_image(full_path)
+        return hardware_id_result, [item.get("id") for item in similar_products_data]
 
-        # Then find similar products
-        similar_products_data = client.find_similar_products(
-            full_path, product_database
-        )
+    @classmethod
+    def perform_mutation(cls, _root, info, /, *, image, input):
+        image_file = info.context.FILES[image]
+        path, full_path, digest = save_uploaded_image(image_file, "pss")
 
-        # Limit the number of results
-        similar_products_data = similar_products_data[:max_results]
+        category_id = input.get("category_id")
+        max_results = input.get("max_results", 3)
 
-        # Get product IDs for storage
-        product_ids = [item.get("id") for item in similar_products_data]
+        client = get_client()
+
+        # Rank products with the vector index once every product is embedded,
+        # otherwise let Gemini rank the catalog directly
+        if product_embeddings_ready():
+            hardware_id_result, product_ids = cls.find_similar_with_embeddings(
+                client, full_path, digest, max_results, category_id
+            )
+        else:
+            hardware_id_result, product_ids = cls.find_similar_with_prompt(
+                client, full_path, digest, max_results, category_id
+            )
 
         # Store the search in the database
         product_search = ProductSimilaritySearch.objects.create(
@@ -281,11 +340,11 @@ class FindSimilarProducts(BaseMutation):
             similar_product_ids=product_ids,
         )
 
-        # Get the actual Product objects
-        similar_products = Product.objects.filter(id__in=product_ids)
+        # Get the actual Product objects, keeping the ranking
+        similar_products = get_products_in_order(product_ids)
 
         return FindSimilarProducts(
-            product_search=product_search, similar_products=list(similar_products)
+            product_search=product_search, similar_products=similar_products
         )
 
 
@@ -325,6 +384,7 @@ class HardwareQueries(graphene.ObjectType):
 
     @staticmethod
     def resolve_hardware_identification(_root, _info, id):
+        _, id = from_global_id_or_error(id, HardwareIdentificationType)
         return HardwareIdentification.objects.filter(pk=id).first()
 
     @staticmethod
@@ -333,7 +393,10 @@ class HardwareQueries(graphene.ObjectType):
 
     @staticmethod
     def resolve_hardware_chat(_root, _info, session_id):
-        return HardwareChat.objects.filter(session_id=session_id).first()
+        try:
+            return HardwareChat.objects.get(session_id=session_id)
+        except HardwareChat.DoesNotExist:
+            return None
 
     @staticmethod
     def resolve_hardware_chats(_root, _info):
@@ -341,6 +404,7 @@ class HardwareQueries(graphene.ObjectType):
 
     @staticmethod
     def resolve_product_similarity_search(_root, _info, id):
+        _, id = from_global_id_or_error(id, ProductSimilaritySearchType)
         return ProductSimilaritySearch.objects.filter(pk=id).first()
 
     @staticmethod
@@ -0,0 +1,38 @@
+import pytest
+
+from ....tests.utils import get_graphql_content
+
+HARDWARE_CHATS_QUERY = """
+    query hardwareChats {
+        hardwareChats {
+            sessionId
+            queries {
+                question
+                answer
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_hardware_chats_with_queries(
+    api_client,
+    hardware_chats,
+    django_assert_num_queries,
+    count_queries,
+):
+    # when
+    with django_assert_num_queries(2):
+        response = api_client.post_graphql(HARDWARE_CHATS_QUERY)
+        content = get_graphql_content(response)
+
+    # then
+    data = content["data"]["hardwareChats"]
+    assert len(data) == len(hardware_chats)
+    for chat in data:
+        assert sorted(query["question"] for query in chat["queries"]) == [
+            "question 1",
+            "question 2",
+        ]
@@ -0,0 +1,116 @@
+from unittest.mock import AsyncMock, patch
+
+import graphene
+
+from .....hardware.models import ProductSimilaritySearch
+from .....hardware.tests.fixtures.hardware import get_embedding
+from .....product.tests.utils import create_image
+from ....tests.utils import get_graphql_content, get_multipart_request_body
+
+FIND_SIMILAR_PRODUCTS_MUTATION = """
+    mutation findSimilarProducts(
+        $image: Upload!, $input: FindSimilarProductsInput!
+    ) {
+        findSimilarProducts(image: $image, input: $input) {
+            productSearch {
+                identifiedComponent
+                similarProducts {
+                    id
+                }
+            }
+            similarProducts {
+                id
+            }
+            hardwareErrors {
+                field
+                message
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.hardware.schema.get_client")
+def test_find_similar_products_with_embeddings(
+    mocked_get_client, api_client, media_root, product_list, product_embeddings
+):
+    # given
+    client = mocked_get_client.return_value
+    client.identify_hardware_from_image = AsyncMock(return_value="NVIDIA RTX 3080")
+    client.identify_and_find_similar_products = AsyncMock()
+    client.embed_query.return_value = get_embedding(0.0, 1.0)
+
+    image_file, image_name = create_image()
+    variables = {"image": image_name, "input": {"maxResults": 2}}
+    body = get_multipart_request_body(
+        FIND_SIMILAR_PRODUCTS_MUTATION, variables, image_file, image_name
+    )
+
+    # when
+    response = api_client.post_multipart(body)
+    content = get_graphql_content(response)
+    data = content["data"]["findSimilarProducts"]
+
+    # then
+    assert not data["hardwareErrors"]
+    expected_ids = [
+        graphene.Node.to_global_id("Product", product.pk)
+        for product in [product_list[2], product_list[1]]
+    ]
+    assert [product["id"] for product in data["similarProducts"]] == expected_ids
+    assert [
+        product["id"] for product in data["productSearch"]["similarProducts"]
+    ] == expected_ids
+    assert data["productSearch"]["identifiedComponent"] == "NVIDIA RTX 3080"
+    client.embed_query.assert_called_once_with("NVIDIA RTX 3080")
+    client.identify_and_find_similar_products.assert_not_awaited()
+    search = ProductSimilaritySearch.objects.get()
+    assert search.similar_product_ids == [
+        str(product_list[2].pk),
+        str(product_list[1].pk),
+    ]
+
+
+@patch("saleor.graphql.hardware.schema.get_client")
+def test_find_similar_products_with_prompt(
+    mocked_get_client, api_client, media_root, product_list
+):
+    # given
+    client = mocked_get_client.return_value
+    client.identify_hardware_from_image = AsyncMock()
+    client.identify_and_find_similar_products = AsyncMock(
+        return_value=(
+            "NVIDIA RTX 3080",
+            [{"id": str(product_list[2].pk)}, {"id": str(product_list[0].pk)}],
+        )
+    )
+
+    image_file, image_name = create_image()
+    variables = {"image": image_name, "input": {"maxResults": 3}}
+    body = get_multipart_request_body(
+        FIND_SIMILAR_PRODUCTS_MUTATION, variables, image_file, image_name
+    )
+
+    # when
+    response = api_client.post_multipart(body)
+    content = get_graphql_content(response)
+    data = content["data"]["findSimilarProducts"]
+
+    # then
+    assert not data["hardwareErrors"]
+    assert [product["id"] for product in data["similarProducts"]] == [
+        graphene.Node.to_global_id("Product", product.pk)
+        for product in [product_list[2], product_list[0]]
+    ]
+    product_database = client.identify_and_find_similar_products.await_args.args[1]
+    assert {product["id"] for product in product_database} == {
+        str(product.pk) for product in product_list
+    }
+    client.identify_hardware_from_image.assert_not_awaited()
+    client.embed_query.assert_not_called()
+    search = ProductSimilaritySearch.objects.get()
+    assert search.identified_component == "NVIDIA RTX 3080"
+    assert search.similar_product_ids == [
+        str(product_list[2].pk),
+        str(product_list[0].pk),
+    ]
@@ -0,0 +1,100 @@
+from unittest.mock import ANY, Mock, patch
+
+from .....hardware.gemini_client import GeminiClient
+from .....hardware.models import HardwareChat, HardwareQuery
+from ....tests.utils import get_graphql_content
+
+HARDWARE_CHAT_MESSAGE_MUTATION = """
+    mutation hardwareChatMessage($input: HardwareChatMessageInput!) {
+        hardwareChatMessage(input: $input) {
+            chat {
+                sessionId
+                queries {
+                    question
+                    answer
+                }
+            }
+            response
+            hardwareErrors {
+                field
+                message
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.hardware.gemini_client.genai")
+@patch("saleor.graphql.hardware.schema.get_client")
+def test_hardware_chat_message(
+    mocked_get_client, mocked_genai, api_client, db, settings
+):
+    # given
+    settings.GEMINI_API_KEY = "test-key"
+    mocked_get_client.return_value = GeminiClient()
+    model = mocked_genai.GenerativeModel.return_value
+    model.start_chat.return_value.send_message.return_value = Mock(
+        text="A 1 TB NVMe drive."
+    )
+    history = [
+        {"role": "user", "parts": ["What storage should I buy?"]},
+        {"role": "model", "parts": ["Get an SSD."]},
+    ]
+    chat = HardwareChat.objects.create(session_id="session", history=history)
+    variables = {"input": {"sessionId": "session", "query": "Which one?"}}
+
+    # when
+    with patch.object(
+        HardwareChat, "save", autospec=True, side_effect=HardwareChat.save
+    ) as mocked_save:
+        response = api_client.post_graphql(HARDWARE_CHAT_MESSAGE_MUTATION, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["hardwareChatMessage"]
+
+    # then
+    assert not data["hardwareErrors"]
+    assert data["response"] == "A 1 TB NVMe drive."
+    assert data["chat"]["sessionId"] == "session"
+    assert data["chat"]["queries"] == [
+        {"question": "Which one?", "answer": "A 1 TB NVMe drive."}
+    ]
+    mocked_save.assert_called_once_with(ANY, update_fields=["history", "updated_at"])
+    chat.refresh_from_db()
+    assert chat.history == [
+        *history,
+        {"role": "user", "parts": ["Which one?"]},
+        {"role": "model", "parts": ["A 1 TB NVMe drive."]},
+    ]
+    model.start_chat.assert_called_once_with(history=chat.history)
+    query = HardwareQuery.objects.get()
+    assert query.chat == chat
+    assert query.question == "Which one?"
+    assert query.answer == "A 1 TB NVMe drive."
+
+
+@patch("saleor.graphql.hardware.schema.get_client")
+def test_hardware_chat_message_new_session(mocked_get_client, api_client, db):
+    # given
+    mocked_get_client.return_value.hardware_chat.return_value = {
+        "response": "Get an SSD.",
+        "history": [
+            {"role": "user", "parts": ["What storage should I buy?"]},
+            {"role": "model", "parts": ["Get an SSD."]},
+        ],
+    }
+    variables = {"input": {"query": "What storage should I buy?"}}
+
+    # when
+    response = api_client.post_graphql(HARDWARE_CHAT_MESSAGE_MUTATION, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["hardwareChatMessage"]
+
+    # then
+    assert data["response"] == "Get an SSD."
+    chat = HardwareChat.objects.get()
+    assert data["chat"]["sessionId"] == chat.session_id
+    assert len(chat.history) == 2
+    mocked_get_client.return_value.hardware_chat.assert_called_once_with(
+        "What storage should I buy?", []
+    )
+    assert HardwareQuery.objects.get().chat == chat
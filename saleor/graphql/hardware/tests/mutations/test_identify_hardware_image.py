@@ -0,0 +1,112 @@
+from unittest.mock import AsyncMock, patch
+
+import graphene
+
+from .....core import JobStatus
+from .....hardware.models import HardwareIdentification
+from .....hardware.tasks import identify_hardware_task
+from .....hardware.utils import get_file_digest
+from .....product.tests.utils import create_image
+from ....tests.utils import get_graphql_content, get_multipart_request_body
+
+IDENTIFY_HARDWARE_IMAGE_MUTATION = """
+    mutation identifyHardwareImage($image: Upload!) {
+        identifyHardwareImage(image: $image) {
+            identification {
+                id
+                status
+                result
+            }
+            hardwareErrors {
+                field
+                message
+            }
+        }
+    }
+"""
+
+HARDWARE_IDENTIFICATION_QUERY = """
+    query hardwareIdentification($id: ID!) {
+        hardwareIdentification(id: $id) {
+            id
+            status
+            result
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.hardware.schema.identify_hardware_task.delay")
+def test_identify_hardware_image(
+    mocked_identify_task,
+    api_client,
+    media_root,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    image_file, image_name = create_image()
+    variables = {"image": image_name}
+    body = get_multipart_request_body(
+        IDENTIFY_HARDWARE_IMAGE_MUTATION, variables, image_file, image_name
+    )
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post_multipart(body)
+    content = get_graphql_content(response)
+    data = content["data"]["identifyHardwareImage"]
+
+    # then
+    assert not data["hardwareErrors"]
+    identification = HardwareIdentification.objects.get()
+    assert data["identification"]["id"] == graphene.Node.to_global_id(
+        "HardwareIdentificationType", identification.pk
+    )
+    assert data["identification"]["status"] == JobStatus.PENDING.upper()
+    assert data["identification"]["result"] == ""
+    assert identification.status == JobStatus.PENDING
+    assert identification.image.name.startswith("hw/")
+    mocked_identify_task.assert_called_once_with(
+        identification.pk, get_file_digest(identification.image.path)
+    )
+
+
+@patch("saleor.hardware.tasks.get_client")
+@patch("saleor.graphql.hardware.schema.identify_hardware_task.delay")
+def test_identify_hardware_image_poll_identification(
+    mocked_identify_task,
+    mocked_get_client,
+    api_client,
+    media_root,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    mocked_get_client.return_value.identify_hardware_from_image = AsyncMock(
+        return_value="Intel Core i9-10900K"
+    )
+    image_file, image_name = create_image()
+    body = get_multipart_request_body(
+        IDENTIFY_HARDWARE_IMAGE_MUTATION, {"image": image_name}, image_file, image_name
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post_multipart(body)
+    content = get_graphql_content(response)
+    identification_id = content["data"]["identifyHardwareImage"]["identification"]["id"]
+    variables = {"id": identification_id}
+
+    response = api_client.post_graphql(HARDWARE_IDENTIFICATION_QUERY, variables)
+    content = get_graphql_content(response)
+    assert content["data"]["hardwareIdentification"]["status"] == (
+        JobStatus.PENDING.upper()
+    )
+
+    # when
+    identify_hardware_task(*mocked_identify_task.call_args.args)
+    response = api_client.post_graphql(HARDWARE_IDENTIFICATION_QUERY, variables)
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["hardwareIdentification"]
+    assert data["id"] == identification_id
+    assert data["status"] == JobStatus.SUCCESS.upper()
+    assert data["result"] == "Intel Core i9-10900K"
@@ -0,0 +1,77 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesce concurrent single-item calls into batched calls.
+
+    Items submitted within `max_wait` seconds of each other, up to `max_batch_size`
+    items, are passed to `batch_fn` together. `batch_fn` runs in a timer thread and
+    must return one result per item, in order. Each caller gets a future resolved
+    with its own result, so the batcher can be used from worker threads as well as
+    awaited from coroutines with `asyncio.wrap_future`.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], list[R]],
+        max_batch_size: int,
+        max_wait: float,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._pending: list[tuple[T, Future[R]]] = []
+        self._timer: threading.Timer | None = None
+
+    def submit(self, item: T) -> Future[R]:
+        future: Future[R] = Future()
+        with self._lock:
+            self._pending.append((item, future))
+            if len(self._pending) == self.max_batch_size:
+                self._schedule_flush(0)
+            elif self._timer is None:
+                self._schedule_flush(self.max_wait)
+        return future
+
+    def _schedule_flush(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                # Superseded by a timer scheduled while this one was starting.
+                return
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            self._timer = None
+            if len(self._pending) >= self.max_batch_size:
+                self._schedule_flush(0)
+            elif self._pending:
+                self._schedule_flush(self.max_wait)
+        if not batch:
+            return
+
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} results from batch, got {len(results)}"
+                )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            future.set_result(result)
@@ -1,8 +1,151 @@
+import asyncio
+import functools
+import hashlib
+import io
+import json
 import mimetypes
-from typing import Any
+import os
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
 
 import google.generativeai as genai
 from django.conf import settings
+from django.core.cache import cache
+from google.api_core import retry, retry_async
+
+from .batching import MicroBatcher
+from .utils import get_file_digest
+
+T = TypeVar("T")
+
+# Bump whenever a prompt changes so that previously cached responses are ignored.
+CACHE_VERSION = 1
+GEMINI_CACHE_TIMEOUT = 60 * 60  # 1 hour
+# Files uploaded through the Files API are deleted by Gemini after 48 hours.
+GEMINI_FILE_CACHE_TIMEOUT = 24 * 60 * 60  # 1 day
+
+# Upper bounds for a single Gemini call and for all of its retries, so a stuck
+# upstream request cannot hold a worker indefinitely.
+GEMINI_REQUEST_TIMEOUT = 15  # seconds
+GEMINI_RETRY_TIMEOUT = 30  # seconds
+# Upper bound for a whole operation awaited with `run_sync`, including file
+# uploads, which the SDK performs without a timeout.
+GEMINI_OPERATION_TIMEOUT = GEMINI_RETRY_TIMEOUT + 10  # seconds
+GEMINI_TIMEOUT_MESSAGE = "Gemini request timed out"
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+QUERY_EMBEDDING_BATCH_SIZE = 32
+QUERY_EMBEDDING_BATCH_WAIT = 0.05  # 50 ms
+
+IDENTIFY_ERROR_PREFIX = "Error processing image"
+# The identification prompt asks Gemini to reply with this for non-hardware images.
+UNIDENTIFIED_HARDWARE_RESPONSE = "I cannot identify this as a PC hardware component"
+
+# Product descriptions are truncated to this length in the similarity prompt.
+PRODUCT_PROMPT_DESCRIPTION_LENGTH = 100
+
+# Files up to this size are sent inline with the prompt instead of through the
+# Files API, which saves a separate upload round-trip.
+INLINE_FILE_MAX_SIZE = 4 * 1024 * 1024  # 4 MB
+
+HARDWARE_CHAT_SYSTEM_INSTRUCTION = (
+    "Act as a professional computer consultant with expertise in both hardware and software. "
+    "Provide accurate and up-to-date recommendations based on the latest technologies and best practices. "
+    "Keep responses concise and answer only the question asked. "
+    "Avoid unnecessary introductions or explanations unless explicitly requested by the user. "
+    "If clarification is needed, ask a short follow-up question. "
+    "Anything not related to computers respond with 'I can't answer that!'"
+)
+
+
+def get_request_options() -> dict[str, Any]:
+    return {
+        "timeout": GEMINI_REQUEST_TIMEOUT,
+        "retry": retry.Retry(timeout=GEMINI_RETRY_TIMEOUT),
+    }
+
+
+def get_async_request_options() -> dict[str, Any]:
+    return {
+        "timeout": GEMINI_REQUEST_TIMEOUT,
+        "retry": retry_async.AsyncRetry(timeout=GEMINI_RETRY_TIMEOUT),
+    }
+
+
+def embed_queries(texts: list[str]) -> list[list[float]]:
+    result = genai.embed_content(  # type: ignore  # noqa: PGH003
+        model=EMBEDDING_MODEL,
+        content=texts,
+        task_type="retrieval_query",
+        request_options=get_request_options(),
+    )
+    return result["embedding"]
+
+
+# Shared by all requests in the process so that concurrent searches are embedded
+# with a single Gemini call.
+query_embedding_batcher = MicroBatcher(
+    embed_queries,
+    max_batch_size=QUERY_EMBEDDING_BATCH_SIZE,
+    max_wait=QUERY_EMBEDDING_BATCH_WAIT,
+)
+
+
+_event_loop: asyncio.AbstractEventLoop | None = None
+_event_loop_lock = threading.Lock()
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            _event_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_event_loop.run_forever, name="gemini-event-loop", daemon=True
+            ).start()
+    return _event_loop
+
+
+def run_sync(
+    coroutine: Coroutine[Any, Any, T], timeout: float = GEMINI_OPERATION_TIMEOUT
+) -> T:
+    """Run a Gemini coroutine from synchronous code and return its result.
+
+    The SDK binds its async gRPC channel to the event loop it is first used on, so
+    all coroutines run on one loop owned by the process. This works the same in
+    request threads and in Celery workers, where each `async_to_sync` call would
+    start a new loop.
+
+    The calling thread still blocks until the coroutine finishes; coroutines only
+    let one operation, such as `identify_and_find_similar_products`, make several
+    Gemini calls concurrently. Methods not used by such operations are synchronous.
+
+    When the coroutine does not finish within `timeout` seconds it is cancelled
+    and `TimeoutError` is raised.
+    """
+    future = asyncio.run_coroutine_threadsafe(coroutine, _get_event_loop())
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+
+def read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def get_cache_key(kind: str, digest: str) -> str:
+    return f"{CACHE_VERSION}:gemini:{kind}:{digest}"
+
+
+def get_chat_digest(query: str, history: list[dict] | None) -> str:
+    payload = json.dumps(
+        [HARDWARE_CHAT_SYSTEM_INSTRUCTION, query, history or []], sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
 
 
 class GeminiClient:
@@ -24,6 +167,7 @@ class GeminiClient:
             "max_output_tokens": 8192,
             "response_mime_type": "text/plain",
         }
+        self._models: dict[tuple[str, str | None], Any] = {}
 
     def _get_model(
         self,
@@ -31,9 +175,23 @@ class GeminiClient:
         generation_config: dict | None = None,
         system_instruction: str | None = None,
     ):
-        """Get a Gemini model with the specified configuration."""
-        config = generation_config or self.base_config
+        """Get a Gemini model with the specified configuration.
+
+        Models using the base config are created once per model name and system
+        instruction, and reused.
+        """
+        if generation_config is None:
+            key = (model_name, system_instruction)
+            if key not in self._models:
+                self._models[key] = self._create_model(
+                    model_name, self.base_config, system_instruction
+                )
+            return self._models[key]
+        return self._create_model(model_name, generation_config, system_instruction)
 
+    def _create_model(
+        self, model_name: str, config: dict, system_instruction: str | None
+    ):
         if system_instruction:
             return genai.GenerativeModel(  # type: ignore  # noqa: PGH003
                 model_name=model_name,
@@ -46,27 +204,83 @@ class GeminiClient:
             generation_config=config,  # type: ignore  # noqa: PGH003
         )
 
-    def _process_uploaded_file(self, file_path: str):
-        """Process a file for use with Gemini API."""
+    async def _process_uploaded_file(self, file_path: str, digest: str | None = None):
+        """Process a file for use with Gemini API.
+
+        Small files are returned as an inline blob; larger ones are uploaded
+        through the Files API. When the file digest is given, the URI of the
+        uploaded file is cached so identical files are uploaded only once. The
+        SDK has no async uploader, so blocking I/O runs in a worker thread to keep
+        the event loop free.
+        """
         try:
             mime_type, _ = mimetypes.guess_type(file_path)
 
             if not mime_type:
                 raise ValueError("Could not determine MIME type")
 
-            gemini_file = genai.upload_file(file_path, mime_type=mime_type)  # type: ignore  # noqa: PGH003
+            if os.path.getsize(file_path) <= INLINE_FILE_MAX_SIZE:
+                data = await asyncio.to_thread(read_file, file_path)
+                return {"mime_type": mime_type, "data": data}
+
+            file_cache_key = get_cache_key("file", digest) if digest else None
+            if file_cache_key:
+                file_uri = await cache.aget(file_cache_key)
+                if file_uri is not None:
+                    return genai.protos.Part(  # type: ignore  # noqa: PGH003
+                        file_data=genai.protos.FileData(
+                            mime_type=mime_type, file_uri=file_uri
+                        )
+                    )
+
+            gemini_file = await asyncio.to_thread(
+                genai.upload_file,  # type: ignore  # noqa: PGH003
+                file_path,
+                mime_type=mime_type,
+            )
+            if file_cache_key:
+                await cache.aset(
+                    file_cache_key, gemini_file.uri, timeout=GEMINI_FILE_CACHE_TIMEOUT
+                )
             return gemini_file
         except Exception as e:
             raise ValueError(f"Error processing file: {str(e)}") from e
 
-    def identify_hardware_from_image(self, image_path: str) -> str:
-        """Identify hardware from an image file path."""
+    async def _get_image_digest(
+        self, image_path: str, image_digest: str | None = None
+    ) -> str:
+        if image_digest:
+            return image_digest
+        return await asyncio.to_thread(get_file_digest, image_path)
+
+    async def identify_hardware_from_image(
+        self, image_path: str, image_digest: str | None = None
+    ) -> str:
+        """Identify hardware from an image file path.
+
+        Results are cached by the image content, so identical images are only
+        sent to Gemini once. Pass `image_digest` when it is already known to skip
+        hashing the file again.
+        """
         try:
-            gemini_file = self._process_uploaded_file(image_path)
+            digest = await self._get_image_digest(image_path, image_digest)
+            cache_key = get_cache_key("identify", digest)
+            cached_result = await cache.aget(cache_key)
+            if cached_result is not None:
+                return cached_result
+            gemini_file = await self._process_uploaded_file(image_path, digest)
+        except Exception as e:
+            return f"{IDENTIFY_ERROR_PREFIX}: {str(e)}"
+        return await self.identify_hardware_from_file(gemini_file, cache_key=cache_key)
 
+    async def identify_hardware_from_file(
+        self, gemini_file, cache_key: str | None = None
+    ) -> str:
+        """Identify hardware from a file prepared for Gemini."""
+        try:
             model = self._get_model(model_name="gemini-2.0-flash")
 
-            response = model.generate_content(
+            response = await model.generate_content_async(
                 [
                     "What object is this? Describe how it might be used",
                     "Object: The input is a PC hardware Image (any hardware component related to computers)",
@@ -75,35 +289,41 @@ class GeminiClient:
                     "Focus on specific characteristics like brand logos, form factors, and component features. "
                     "The output should only be the exact name of the device, for example, 'Intel Core i9-10900K' for a processor "
                     "or 'ASUS B560 Motherboard' for a motherboard. If given any other images simply reply with "
-                    "'I cannot identify this as a PC hardware component'",
+                    f"'{UNIDENTIFIED_HARDWARE_RESPONSE}'",
                     "Object: ",
                     gemini_file,
                     "",
                     "Description: ",
-                ]
+                ],
+                request_options=get_async_request_options(),
             )
 
-            return response.text.strip()
+            result = response.text.strip()
+            if cache_key:
+                await cache.aset(cache_key, result, timeout=GEMINI_CACHE_TIMEOUT)
+            return result
         except Exception as e:
-            return f"Error processing image: {str(e)}"
+            return f"{IDENTIFY_ERROR_PREFIX}: {str(e)}"
 
-    def find_similar_products(
-        self, image_path: str, product_database: list[dict[str, Any]]
+    async def find_similar_products_from_file(
+        self, gemini_file, product_database: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
-        """Find similar products based on an image file path."""
+        """Find similar products based on a file prepared for Gemini."""
         try:
-            gemini_file = self._process_uploaded_file(image_path)
-
             model = self._get_model(model_name="gemini-2.0-flash")
 
-            # Convert our product database to a string format that Gemini can process
-            products_string = "\n".join(
-                f"Product ID: {p.get('id', '')}, Name: {p.get('name', '')}, "
-                f"Category: {p.get('category', '')}, Description: {p.get('description', '')[:100]}..."
-                for p in product_database
-            )
+            # Convert our product database to a string format that Gemini can process,
+            # writing straight into a buffer instead of building a list of lines
+            products_buffer = io.StringIO()
+            for p in product_database:
+                products_buffer.write(
+                    f"Product ID: {p.get('id', '')}, Name: {p.get('name', '')}, "
+                    f"Category: {p.get('category', '')}, "
+                    f"Description: {p.get('description', '')}...\n"
+                )
+            products_string = products_buffer.getvalue()
 
-            response = model.generate_content(
+            response = await model.generate_content_async(
                 [
                     "I have an image of a PC hardware component and a database of products. "
                     "Based on the image, identify the component and suggest the most similar products "
@@ -113,56 +333,118 @@ class GeminiClient:
                     "Product Database:",
                     products_string,
                     "Most similar product IDs (comma separated):",
-                ]
+                ],
+                request_options=get_async_request_options(),
             )
 
             # Parse the response to get product IDs
             product_ids = [pid.strip() for pid in response.text.strip().split(",")]
 
-            # Return the matching products from our database
-            return [p for p in product_database if str(p.get("id", "")) in product_ids]
+            # Return the matching products from our database in the order Gemini
+            # ranked them
+            products_by_id = {str(p.get("id", "")): p for p in product_database}
+            return [
+                products_by_id[product_id]
+                for product_id in dict.fromkeys(product_ids)
+                if product_id in products_by_id
+            ]
         except Exception as e:
             return []
 
+    async def identify_and_find_similar_products(
+        self,
+        image_path: str,
+        product_database: list[dict[str, Any]],
+        image_digest: str | None = None,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Identify hardware and find similar products from a single upload.
+
+        The image is prepared for Gemini once and both prompts run concurrently.
+        """
+        try:
+            digest = await self._get_image_digest(image_path, image_digest)
+            cache_key = get_cache_key("identify", digest)
+            gemini_file = await self._process_uploaded_file(image_path, digest)
+        except Exception as e:
+            return f"{IDENTIFY_ERROR_PREFIX}: {str(e)}", []
+
+        identified_component = await cache.aget(cache_key)
+        if identified_component is not None:
+            similar_products = await self.find_similar_products_from_file(
+                gemini_file, product_database
+            )
+            return identified_component, similar_products
+
+        identified_component, similar_products = await asyncio.gather(
+            self.identify_hardware_from_file(gemini_file, cache_key=cache_key),
+            self.find_similar_products_from_file(gemini_file, product_database),
+        )
+        return identified_component, similar_products
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of product descriptions for similarity search."""
+        result = genai.embed_content(  # type: ignore  # noqa: PGH003
+            model=EMBEDDING_MODEL,
+            content=texts,
+            task_type="retrieval_document",
+            request_options=get_request_options(),
+        )
+        return result["embedding"]
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a search query for similarity search.
+
+        Queries from concurrent requests are batched into one Gemini call.
+        """
+        return query_embedding_batcher.submit(text).result(
+            timeout=GEMINI_OPERATION_TIMEOUT
+        )
+
     def hardware_chat(
         self, query: str, history: list[dict] | None = None
     ) -> dict[str, Any]:
-        """Chat with Gemini about hardware."""
+        """Chat with Gemini about hardware.
+
+        Answers are cached by the query and the conversation history. The given
+        history list is extended in place with the new question and answer.
+        """
         try:
-            system_instruction = (
-                "Act as a professional computer consultant with expertise in both hardware and software. "
-                "Provide accurate and up-to-date recommendations based on the latest technologies and best practices. "
-                "Keep responses concise and answer only the question asked. "
-                "Avoid unnecessary introductions or explanations unless explicitly requested by the user. "
-                "If clarification is needed, ask a short follow-up question. "
-                "Anything not related to computers respond with 'I can't answer that!'"
-            )
+            cache_key = get_cache_key("chat", get_chat_digest(query, history))
+            response_text = cache.get(cache_key)
 
-            model = self._get_model(
-                model_name="gemini-2.0-flash", system_instruction=system_instruction
-            )
+            if response_text is None:
+                model = self._get_model(
+                    model_name="gemini-2.0-flash",
+                    system_instruction=HARDWARE_CHAT_SYSTEM_INSTRUCTION,
+                )
 
-            if history:
-                chat = model.start_chat(history=history)
-                response = chat.send_message(query)
-            else:
-                response = model.generate_content(query)
+                if history:
+                    chat = model.start_chat(history=history)
+                    response = chat.send_message(
+                        query, request_options=get_request_options()
+                    )
+                else:
+                    response = model.generate_content(
+                        query, request_options=get_request_options()
+                    )
 
-            return {
-                "response": response.text.strip(),
-                "history": history
-                + [
-                    {"role": "user", "parts": [query]},
-                    {"role": "model", "parts": [response.text.strip()]},
-                ]
-                if history
-                else [
-                    {"role": "user", "parts": [query]},
-                    {"role": "model", "parts": [response.text.strip()]},
-                ],
-            }
+                response_text = response.text.strip()
+                cache.set(cache_key, response_text, timeout=GEMINI_CACHE_TIMEOUT)
+
+            # Extend the history in place instead of copying it on every message
+            history = history if history is not None else []
+            history.append({"role": "user", "parts": [query]})
+            history.append({"role": "model", "parts": [response_text]})
+
+            return {"response": response_text, "history": history}
         except Exception as e:
             return {
                 "response": f"Error processing query: {str(e)}",
                 "history": history or [],
             }
+
+
+@functools.cache
+def get_client() -> GeminiClient:
+    """Return the Gemini client shared by the whole process."""
+    return GeminiClient()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...tasks import update_product_embeddings_task
+
+
+class Command(BaseCommand):
+    help = "Populate product embeddings used by hardware similarity search."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Updating product embeddings")
+        update_product_embeddings_task.delay()
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.18 on 2026-10-15 12:00
+
+import django.db.models.deletion
+import pgvector.django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0197_productvariantchannellisting_prior_price_amount"),
+        ("hardware", "0001_initial"),
+    ]
+
+    operations = [
+        pgvector.django.VectorExtension(),
+        migrations.CreateModel(
+            name="ProductEmbedding",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="hardware_embedding",
+                        serialize=False,
+                        to="product.product",
+                    ),
+                ),
+                ("embedding", pgvector.django.VectorField(dimensions=768)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    pgvector.django.HnswIndex(
+                        ef_construction=64,
+                        fields=["embedding"],
+                        m=16,
+                        name="product_embedding_hnsw_idx",
+                        opclasses=["vector_cosine_ops"],
+                    )
+                ],
+            },
+        ),
+    ]
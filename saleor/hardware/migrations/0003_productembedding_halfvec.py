@@ -0,0 +1,32 @@
+# Generated by Django 4.2.18 on 2026-10-15 12:30
+
+import pgvector.django
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hardware", "0002_productembedding"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="productembedding",
+            name="product_embedding_hnsw_idx",
+        ),
+        migrations.AlterField(
+            model_name="productembedding",
+            name="embedding",
+            field=pgvector.django.HalfVectorField(dimensions=768),
+        ),
+        migrations.AddIndex(
+            model_name="productembedding",
+            index=pgvector.django.HnswIndex(
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="product_embedding_hnsw_idx",
+                opclasses=["halfvec_cosine_ops"],
+            ),
+        ),
+    ]
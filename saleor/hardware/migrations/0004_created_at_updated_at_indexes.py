@@ -0,0 +1,32 @@
+# Generated by Django 4.2.18 on 2026-10-15 13:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hardware", "0003_productembedding_halfvec"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hardwarechat",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="hardwareidentification",
+            name="created_at",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now
+            ),
+        ),
+        migrations.AlterField(
+            model_name="productsimilaritysearch",
+            name="created_at",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now
+            ),
+        ),
+    ]
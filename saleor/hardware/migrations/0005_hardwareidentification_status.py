@@ -0,0 +1,47 @@
+# Generated by Django 4.2.18 on 2026-10-15 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hardware", "0004_created_at_updated_at_indexes"),
+    ]
+
+    operations = [
+        # Identifications created before this migration were processed
+        # synchronously, so they are marked as finished.
+        migrations.AddField(
+            model_name="hardwareidentification",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("success", "Success"),
+                    ("failed", "Failed"),
+                    ("deleted", "Deleted"),
+                ],
+                default="success",
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hardwareidentification",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("success", "Success"),
+                    ("failed", "Failed"),
+                    ("deleted", "Deleted"),
+                ],
+                default="pending",
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hardwareidentification",
+            name="result",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
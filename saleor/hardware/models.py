@@ -1,13 +1,27 @@
 from django.db import models
 from django.utils import timezone
+from pgvector.django import HalfVectorField, HnswIndex
+
+from ..core import JobStatus
+from ..product.models import Product
+
+# Output size of the Gemini text embedding model used to fill `ProductEmbedding`.
+EMBEDDING_DIMENSIONS = 768
 
 
 class HardwareIdentification(models.Model):
-    """Model for storing hardware identification records."""
+    """Model for storing hardware identification records.
+
+    Identification runs in a Celery task; `result` is filled in once the task
+    finishes and `status` reflects its progress.
+    """
 
     image = models.ImageField(upload_to="hw")
-    result = models.TextField()
-    created_at = models.DateTimeField(default=timezone.now)
+    result = models.TextField(blank=True, default="")
+    status = models.CharField(
+        max_length=50, choices=JobStatus.CHOICES, default=JobStatus.PENDING
+    )
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     def __str__(self):
         return f"Hardware identification at {self.created_at}"
@@ -22,7 +36,7 @@ class HardwareChat(models.Model):
     session_id = models.CharField(max_length=100, unique=True)
     history = models.JSONField(default=list)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"Chat session {self.session_id}"
@@ -54,7 +68,7 @@ class ProductSimilaritySearch(models.Model):
     image = models.ImageField(upload_to="product_similarity_searches")
     identified_component = models.TextField(null=True, blank=True)
     similar_product_ids = models.JSONField(default=list)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     def __str__(self):
         return f"Product similarity search at {self.created_at}"
@@ -62,3 +76,34 @@ class ProductSimilaritySearch(models.Model):
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Product similarity searches"
+
+
+class ProductEmbedding(models.Model):
+    """Model for storing product text embeddings used by similarity search.
+
+    Embeddings are kept in half precision, which halves the size of the table and
+    its HNSW index at a negligible cost in ranking quality.
+    """
+
+    product = models.OneToOneField(
+        Product,
+        related_name="hardware_embedding",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    embedding = HalfVectorField(dimensions=EMBEDDING_DIMENSIONS)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Embedding of product {self.product_id}"
+
+    class Meta:
+        indexes = [
+            HnswIndex(
+                name="product_embedding_hnsw_idx",
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["halfvec_cosine_ops"],
+            ),
+        ]
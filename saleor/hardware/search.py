@@ -0,0 +1,111 @@
+import logging
+from collections.abc import Iterable
+
+from django.db import connection
+from django.db.models import F, Q
+from pgvector.django import CosineDistance, HalfVector
+
+from ..core.tracing import traced_atomic_transaction
+from ..product.models import Product
+from .gemini_client import (
+    IDENTIFY_ERROR_PREFIX,
+    UNIDENTIFIED_HARDWARE_RESPONSE,
+    GeminiClient,
+    get_client,
+)
+from .models import ProductEmbedding
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_EMBEDDING_BATCH_SIZE = 100
+PRODUCT_EMBEDDING_DESCRIPTION_LENGTH = 500
+
+
+def get_products_with_outdated_embeddings():
+    return Product.objects.filter(
+        Q(hardware_embedding__isnull=True)
+        | Q(updated_at__gt=F("hardware_embedding__updated_at"))
+    )
+
+
+def prepare_product_embedding_text(product: Product) -> str:
+    category = product.category.name if product.category else ""
+    description = product.description_plaintext[:PRODUCT_EMBEDDING_DESCRIPTION_LENGTH]
+    return f"Name: {product.name}\nCategory: {category}\nDescription: {description}"
+
+
+def update_product_embeddings(product_ids: Iterable[int]):
+    products = list(
+        Product.objects.filter(id__in=product_ids)
+        .select_related("category")
+        .only("id", "name", "description_plaintext", "category__name")
+    )
+    if not products:
+        return
+
+    embeddings = get_client().embed_documents(
+        [prepare_product_embedding_text(product) for product in products]
+    )
+    ProductEmbedding.objects.bulk_create(
+        [
+            ProductEmbedding(product_id=product.id, embedding=embedding)
+            for product, embedding in zip(products, embeddings, strict=True)
+        ],
+        update_conflicts=True,
+        unique_fields=["product"],
+        update_fields=["embedding", "updated_at"],
+    )
+
+
+def product_embeddings_ready() -> bool:
+    """Return whether every product has an embedding.
+
+    Until the backfill covers the whole catalog, a vector search would only see
+    the products embedded so far.
+    """
+    return (
+        ProductEmbedding.objects.exists()
+        and not Product.objects.filter(hardware_embedding__isnull=True).exists()
+    )
+
+
+def search_similar_product_ids(
+    embedding: list[float], max_results: int, category_id=None
+) -> list[int]:
+    """Return IDs of products closest to the embedding by cosine distance.
+
+    Ordering by `CosineDistance` lets Postgres serve the query from the HNSW index
+    on `ProductEmbedding.embedding`. The index scan only yields `hnsw.ef_search`
+    candidates before other filters apply, so a search limited to a category
+    disables index scans and ranks the category's embeddings exactly instead.
+    """
+    embeddings = ProductEmbedding.objects.order_by(
+        CosineDistance("embedding", HalfVector(embedding))
+    ).values_list("product_id", flat=True)
+    if not category_id:
+        return list(embeddings[:max_results])
+
+    with traced_atomic_transaction():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_indexscan = off")
+        return list(embeddings.filter(product__category_id=category_id)[:max_results])
+
+
+def search_products_by_component(
+    client: GeminiClient, identified_component: str, max_results: int, category_id=None
+) -> list[int]:
+    """Return IDs of products most similar to the identified hardware component.
+
+    Failed identifications and images Gemini did not recognize as hardware have
+    no similar products.
+    """
+    if identified_component.startswith(IDENTIFY_ERROR_PREFIX):
+        return []
+    if UNIDENTIFIED_HARDWARE_RESPONSE.lower() in identified_component.lower():
+        return []
+    try:
+        embedding = client.embed_query(identified_component)
+    except Exception:
+        logger.exception("Failed to embed identified hardware component.")
+        return []
+    return search_similar_product_ids(embedding, max_results, category_id)
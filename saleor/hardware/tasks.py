@@ -0,0 +1,73 @@
+from celery.utils.log import get_task_logger
+from django.conf import settings
+
+from ..celeryconf import app
+from ..core import JobStatus
+from ..core.db.connection import allow_writer
+from .gemini_client import (
+    GEMINI_TIMEOUT_MESSAGE,
+    IDENTIFY_ERROR_PREFIX,
+    get_client,
+    run_sync,
+)
+from .models import HardwareIdentification
+from .search import (
+    PRODUCT_EMBEDDING_BATCH_SIZE,
+    get_products_with_outdated_embeddings,
+    update_product_embeddings,
+)
+from .utils import stored_file_local_copy
+
+task_logger = get_task_logger(__name__)
+
+
+@app.task
+@allow_writer()
+def update_product_embeddings_task():
+    if not getattr(settings, "GEMINI_API_KEY", ""):
+        task_logger.info("GEMINI_API_KEY is not set, skipping product embeddings.")
+        return
+
+    product_ids = list(
+        get_products_with_outdated_embeddings()
+        .order_by("pk")
+        .values_list("pk", flat=True)[:PRODUCT_EMBEDDING_BATCH_SIZE]
+    )
+    if not product_ids:
+        task_logger.info("No products with outdated embeddings.")
+        return
+
+    update_product_embeddings(product_ids)
+    task_logger.info("Updated embeddings for %s products.", len(product_ids))
+    if len(product_ids) == PRODUCT_EMBEDDING_BATCH_SIZE:
+        update_product_embeddings_task.delay()
+
+
+@app.task
+@allow_writer()
+def identify_hardware_task(identification_id: int, image_digest: str | None = None):
+    identification = HardwareIdentification.objects.filter(pk=identification_id).first()
+    if not identification:
+        task_logger.warning(
+            "Hardware identification %s does not exist.", identification_id
+        )
+        return
+
+    client = get_client()
+    try:
+        with stored_file_local_copy(identification.image.name) as image_path:
+            result = run_sync(
+                client.identify_hardware_from_image(image_path, image_digest)
+            )
+    except TimeoutError:
+        result = f"{IDENTIFY_ERROR_PREFIX}: {GEMINI_TIMEOUT_MESSAGE}"
+    except OSError as e:
+        result = f"{IDENTIFY_ERROR_PREFIX}: {str(e)}"
+
+    identification.result = result
+    identification.status = (
+        JobStatus.FAILED
+        if result.startswith(IDENTIFY_ERROR_PREFIX)
+        else JobStatus.SUCCESS
+    )
+    identification.save(update_fields=["result", "status"])
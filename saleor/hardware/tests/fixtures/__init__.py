@@ -0,0 +1 @@
+from .hardware import *  # noqa: F403
@@ -0,0 +1,49 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from ...models import (
+    EMBEDDING_DIMENSIONS,
+    HardwareChat,
+    HardwareIdentification,
+    HardwareQuery,
+    ProductEmbedding,
+)
+
+
+def get_embedding(*values):
+    return [*values] + [0.0] * (EMBEDDING_DIMENSIONS - len(values))
+
+
+@pytest.fixture
+def hardware_identification(db, media_root):
+    image = default_storage.save("hw/image.jpg", ContentFile(b"image-data"))
+    return HardwareIdentification.objects.create(image=image)
+
+
+@pytest.fixture
+def hardware_chats(db):
+    chats = HardwareChat.objects.bulk_create(
+        [HardwareChat(session_id=f"session-{i}") for i in range(3)]
+    )
+    HardwareQuery.objects.bulk_create(
+        [
+            HardwareQuery(chat=chat, question=question, answer="answer")
+            for chat in chats
+            for question in ["question 1", "question 2"]
+        ]
+    )
+    return chats
+
+
+@pytest.fixture
+def product_embeddings(product_list):
+    # The products are, in order, at increasing cosine distance from
+    # `get_embedding(1.0)`.
+    embeddings = [get_embedding(1.0), get_embedding(1.0, 1.0), get_embedding(0.0, 1.0)]
+    return ProductEmbedding.objects.bulk_create(
+        [
+            ProductEmbedding(product=product, embedding=embedding)
+            for product, embedding in zip(product_list, embeddings, strict=True)
+        ]
+    )
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from ..batching import MicroBatcher
+
+TIMEOUT = 5
+
+
+class RecordingBatchFn:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(items)
+        return [item * 2 for item in items]
+
+
+def test_micro_batcher_coalesces_items_submitted_within_window():
+    # given
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=10, max_wait=0.1)
+
+    # when
+    futures = [batcher.submit(item) for item in range(3)]
+    results = [future.result(timeout=TIMEOUT) for future in futures]
+
+    # then
+    assert results == [0, 2, 4]
+    assert batch_fn.batches == [[0, 1, 2]]
+
+
+def test_micro_batcher_caps_batch_size():
+    # given
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=5, max_wait=0.1)
+
+    # when
+    futures = [batcher.submit(item) for item in range(12)]
+    results = [future.result(timeout=TIMEOUT) for future in futures]
+
+    # then
+    assert results == [item * 2 for item in range(12)]
+    assert [len(batch) for batch in batch_fn.batches] == [5, 5, 2]
+
+
+def test_micro_batcher_waits_for_more_items_after_full_batch():
+    # given
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=5, max_wait=1)
+    futures = [batcher.submit(item) for item in range(6)]
+    futures[0].result(timeout=TIMEOUT)
+    time.sleep(0.1)
+
+    # when
+    futures += [batcher.submit(item) for item in range(6, 10)]
+    results = [future.result(timeout=TIMEOUT) for future in futures]
+
+    # then
+    assert results == [item * 2 for item in range(10)]
+    assert batch_fn.batches == [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]]
+
+
+def test_micro_batcher_propagates_error_to_every_future():
+    # given
+    error = ValueError("Batch failed")
+
+    def batch_fn(items):
+        raise error
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=10, max_wait=0.01)
+
+    # when
+    futures = [batcher.submit(item) for item in range(3)]
+
+    # then
+    for future in futures:
+        assert future.exception(timeout=TIMEOUT) is error
+
+
+def test_micro_batcher_fails_on_result_count_mismatch():
+    # given
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=10, max_wait=0.01)
+
+    # when
+    futures = [batcher.submit(item) for item in range(3)]
+
+    # then
+    for future in futures:
+        with pytest.raises(ValueError, match="Expected 3 results from batch, got 2"):
+            future.result(timeout=TIMEOUT)
@@ -0,0 +1,14 @@
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+
+@patch(
+    "saleor.hardware.management.commands.update_product_embeddings.update_product_embeddings_task.delay"
+)
+def test_update_product_embeddings_command(mocked_delay):
+    # when
+    call_command("update_product_embeddings")
+
+    # then
+    mocked_delay.assert_called_once_with()
@@ -0,0 +1,226 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from django.core.cache import cache
+
+from ..gemini_client import (
+    CACHE_VERSION,
+    IDENTIFY_ERROR_PREFIX,
+    GeminiClient,
+    get_cache_key,
+    get_chat_digest,
+)
+
+
+@pytest.fixture
+def mocked_genai():
+    with patch("saleor.hardware.gemini_client.genai") as mocked_genai:
+        yield mocked_genai
+
+
+@pytest.fixture
+def gemini_client(mocked_genai, settings):
+    settings.GEMINI_API_KEY = "test-key"
+    cache.clear()
+    yield GeminiClient()
+    cache.clear()
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"image-data")
+    return str(path)
+
+
+def test_get_cache_key():
+    assert get_cache_key("identify", "digest") == (
+        f"{CACHE_VERSION}:gemini:identify:digest"
+    )
+
+
+async def test_identify_hardware_from_image_cached(
+    gemini_client, mocked_genai, image_path
+):
+    # given
+    generate_content = AsyncMock(return_value=Mock(text=" Intel Core i9-10900K\n"))
+    mocked_genai.GenerativeModel.return_value.generate_content_async = generate_content
+
+    # when
+    first_result = await gemini_client.identify_hardware_from_image(
+        image_path, "digest"
+    )
+    second_result = await gemini_client.identify_hardware_from_image(
+        image_path, "digest"
+    )
+
+    # then
+    assert first_result == second_result == "Intel Core i9-10900K"
+    generate_content.assert_awaited_once()
+    assert cache.get(get_cache_key("identify", "digest")) == "Intel Core i9-10900K"
+
+
+async def test_identify_hardware_from_image_different_images(
+    gemini_client, mocked_genai, image_path
+):
+    # given
+    generate_content = AsyncMock(return_value=Mock(text="Intel Core i9-10900K"))
+    mocked_genai.GenerativeModel.return_value.generate_content_async = generate_content
+
+    # when
+    await gemini_client.identify_hardware_from_image(image_path, "digest")
+    await gemini_client.identify_hardware_from_image(image_path, "other-digest")
+
+    # then
+    assert generate_content.await_count == 2
+
+
+async def test_identify_hardware_from_image_error_not_cached(
+    gemini_client, mocked_genai, image_path
+):
+    # given
+    generate_content = AsyncMock(
+        side_effect=[ValueError("Quota exceeded"), Mock(text="Intel Core i9-10900K")]
+    )
+    mocked_genai.GenerativeModel.return_value.generate_content_async = generate_content
+
+    # when
+    first_result = await gemini_client.identify_hardware_from_image(
+        image_path, "digest"
+    )
+    second_result = await gemini_client.identify_hardware_from_image(
+        image_path, "digest"
+    )
+
+    # then
+    assert first_result == f"{IDENTIFY_ERROR_PREFIX}: Quota exceeded"
+    assert second_result == "Intel Core i9-10900K"
+    assert generate_content.await_count == 2
+
+
+@patch("saleor.hardware.gemini_client.INLINE_FILE_MAX_SIZE", 0)
+async def test_process_uploaded_file_cached(gemini_client, mocked_genai, image_path):
+    # given
+    mocked_genai.upload_file.return_value = Mock(uri="files/image")
+
+    # when
+    uploaded_file = await gemini_client._process_uploaded_file(image_path, "digest")
+    cached_file = await gemini_client._process_uploaded_file(image_path, "digest")
+
+    # then
+    assert uploaded_file is mocked_genai.upload_file.return_value
+    mocked_genai.upload_file.assert_called_once_with(image_path, mime_type="image/jpeg")
+    assert cached_file is mocked_genai.protos.Part.return_value
+    mocked_genai.protos.FileData.assert_called_once_with(
+        mime_type="image/jpeg", file_uri="files/image"
+    )
+    assert cache.get(get_cache_key("file", "digest")) == "files/image"
+
+
+async def test_process_uploaded_file_inline(gemini_client, mocked_genai, image_path):
+    # when
+    gemini_file = await gemini_client._process_uploaded_file(image_path, "digest")
+
+    # then
+    assert gemini_file == {"mime_type": "image/jpeg", "data": b"image-data"}
+    mocked_genai.upload_file.assert_not_called()
+
+
+def test_hardware_chat_cached(gemini_client, mocked_genai):
+    # given
+    generate_content = mocked_genai.GenerativeModel.return_value.generate_content
+    generate_content.return_value = Mock(text="Get an SSD.")
+
+    # when
+    first_result = gemini_client.hardware_chat("What storage should I buy?", [])
+    second_result = gemini_client.hardware_chat("What storage should I buy?", [])
+
+    # then
+    assert first_result["response"] == second_result["response"] == "Get an SSD."
+    generate_content.assert_called_once()
+    cache_key = get_cache_key("chat", get_chat_digest("What storage should I buy?", []))
+    assert cache_key.startswith(f"{CACHE_VERSION}:")
+    assert cache.get(cache_key) == "Get an SSD."
+
+
+def test_hardware_chat_cached_by_history(gemini_client, mocked_genai):
+    # given
+    model = mocked_genai.GenerativeModel.return_value
+    model.generate_content.return_value = Mock(text="Get an SSD.")
+    model.start_chat.return_value.send_message.return_value = Mock(
+        text="A 1 TB NVMe drive."
+    )
+    history = [
+        {"role": "user", "parts": ["What storage should I buy?"]},
+        {"role": "model", "parts": ["Get an SSD."]},
+    ]
+
+    # when
+    gemini_client.hardware_chat("Which one?", [])
+    result = gemini_client.hardware_chat("Which one?", history)
+
+    # then
+    assert result["response"] == "A 1 TB NVMe drive."
+    model.start_chat.return_value.send_message.assert_called_once()
+
+
+def test_hardware_chat_error_not_cached(gemini_client, mocked_genai):
+    # given
+    generate_content = mocked_genai.GenerativeModel.return_value.generate_content
+    generate_content.side_effect = [
+        ValueError("Quota exceeded"),
+        Mock(text="Get an SSD."),
+    ]
+
+    # when
+    first_result = gemini_client.hardware_chat("What storage should I buy?", [])
+    second_result = gemini_client.hardware_chat("What storage should I buy?", [])
+
+    # then
+    assert first_result["response"] == "Error processing query: Quota exceeded"
+    assert second_result["response"] == "Get an SSD."
+    assert generate_content.call_count == 2
+
+
+def test_hardware_chat_extends_history_in_place(gemini_client, mocked_genai):
+    # given
+    model = mocked_genai.GenerativeModel.return_value
+    model.start_chat.return_value.send_message.return_value = Mock(
+        text="A 1 TB NVMe drive."
+    )
+    history = [
+        {"role": "user", "parts": ["What storage should I buy?"]},
+        {"role": "model", "parts": ["Get an SSD."]},
+    ]
+
+    # when
+    result = gemini_client.hardware_chat("Which one?", history)
+
+    # then
+    assert result["history"] is history
+    assert history[2:] == [
+        {"role": "user", "parts": ["Which one?"]},
+        {"role": "model", "parts": ["A 1 TB NVMe drive."]},
+    ]
+    assert len(history) == 4
+
+
+async def test_find_similar_products_from_file_keeps_ranking(
+    gemini_client, mocked_genai
+):
+    # given
+    mocked_genai.GenerativeModel.return_value.generate_content_async = AsyncMock(
+        return_value=Mock(text="3, 1, 3, 4\n")
+    )
+    product_database = [
+        {"id": str(i), "name": f"Product {i}", "category": "GPU", "description": ""}
+        for i in range(1, 4)
+    ]
+
+    # when
+    similar_products = await gemini_client.find_similar_products_from_file(
+        Mock(), product_database
+    )
+
+    # then
+    assert similar_products == [product_database[2], product_database[0]]
@@ -0,0 +1,183 @@
+import datetime
+from unittest.mock import Mock, patch
+
+from django.utils import timezone
+
+from ...product.models import Category, Product
+from ..gemini_client import IDENTIFY_ERROR_PREFIX, UNIDENTIFIED_HARDWARE_RESPONSE
+from ..models import ProductEmbedding
+from ..search import (
+    get_products_with_outdated_embeddings,
+    product_embeddings_ready,
+    search_products_by_component,
+    search_similar_product_ids,
+    update_product_embeddings,
+)
+from .fixtures.hardware import get_embedding
+
+
+def test_get_products_with_outdated_embeddings(product_list):
+    # given
+    product_without_embedding, outdated_product, up_to_date_product = product_list
+    ProductEmbedding.objects.bulk_create(
+        [
+            ProductEmbedding(product=outdated_product, embedding=get_embedding(1.0)),
+            ProductEmbedding(product=up_to_date_product, embedding=get_embedding(1.0)),
+        ]
+    )
+    Product.objects.filter(pk=outdated_product.pk).update(
+        updated_at=timezone.now() + datetime.timedelta(minutes=1)
+    )
+
+    # when
+    products = get_products_with_outdated_embeddings()
+
+    # then
+    assert set(products) == {product_without_embedding, outdated_product}
+
+
+@patch("saleor.hardware.search.get_client")
+def test_update_product_embeddings(mocked_get_client, product_list):
+    # given
+    product = product_list[0]
+    ProductEmbedding.objects.create(product=product, embedding=get_embedding(1.0))
+    mocked_get_client.return_value.embed_documents.return_value = [
+        get_embedding(0.0, 1.0)
+    ]
+
+    # when
+    update_product_embeddings([product.pk])
+
+    # then
+    embedding = ProductEmbedding.objects.get(product=product)
+    assert embedding.embedding.to_list() == get_embedding(0.0, 1.0)
+    texts = mocked_get_client.return_value.embed_documents.call_args.args[0]
+    assert texts == [
+        f"Name: {product.name}\nCategory: {product.category.name}\n"
+        f"Description: {product.description_plaintext}"
+    ]
+
+
+def test_product_embeddings_ready(product_embeddings):
+    assert product_embeddings_ready()
+
+
+def test_product_embeddings_ready_during_backfill(product_embeddings):
+    # given
+    product_embeddings[0].delete()
+
+    # when & then
+    assert not product_embeddings_ready()
+
+
+def test_product_embeddings_ready_without_embeddings(product_list):
+    assert not product_embeddings_ready()
+
+
+def test_search_similar_product_ids_orders_by_distance(
+    product_list, product_embeddings
+):
+    # when
+    product_ids = search_similar_product_ids(get_embedding(1.0), max_results=3)
+
+    # then
+    assert product_ids == [product.pk for product in product_list]
+
+
+def test_search_similar_product_ids_max_results(product_list, product_embeddings):
+    # when
+    product_ids = search_similar_product_ids(get_embedding(0.0, 1.0), max_results=2)
+
+    # then
+    assert product_ids == [product_list[2].pk, product_list[1].pk]
+
+
+def test_search_similar_product_ids_in_category(
+    product_list, product_embeddings, product_type
+):
+    # given
+    # More products closer to the query than the category has are outside of it,
+    # so an approximate index scan alone would not reach the category products.
+    other_category = Category.objects.create(name="Other", slug="other")
+    other_products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Other product {i}",
+                slug=f"other-product-{i}",
+                product_type=product_type,
+                category=other_category,
+            )
+            for i in range(50)
+        ]
+    )
+    ProductEmbedding.objects.bulk_create(
+        [
+            ProductEmbedding(product=product, embedding=get_embedding(1.0))
+            for product in other_products
+        ]
+    )
+
+    # when
+    product_ids = search_similar_product_ids(
+        get_embedding(1.0), max_results=3, category_id=product_list[0].category_id
+    )
+
+    # then
+    assert product_ids == [product.pk for product in product_list]
+
+
+def test_search_products_by_component(product_list, product_embeddings):
+    # given
+    client = Mock()
+    client.embed_query.return_value = get_embedding(0.0, 1.0)
+
+    # when
+    product_ids = search_products_by_component(
+        client, "ASUS B560 Motherboard", max_results=1
+    )
+
+    # then
+    assert product_ids == [product_list[2].pk]
+    client.embed_query.assert_called_once_with("ASUS B560 Motherboard")
+
+
+def test_search_products_by_component_embedding_error(product_embeddings):
+    # given
+    client = Mock()
+    client.embed_query.side_effect = ValueError("Embedding failed")
+
+    # when
+    product_ids = search_products_by_component(
+        client, "ASUS B560 Motherboard", max_results=3
+    )
+
+    # then
+    assert product_ids == []
+
+
+def test_search_products_by_component_failed_identification():
+    # given
+    client = Mock()
+
+    # when
+    product_ids = search_products_by_component(
+        client, f"{IDENTIFY_ERROR_PREFIX}: Invalid image", max_results=3
+    )
+
+    # then
+    assert product_ids == []
+    client.embed_query.assert_not_called()
+
+
+def test_search_products_by_component_not_hardware():
+    # given
+    client = Mock()
+
+    # when
+    product_ids = search_products_by_component(
+        client, f"'{UNIDENTIFIED_HARDWARE_RESPONSE}.'", max_results=3
+    )
+
+    # then
+    assert product_ids == []
+    client.embed_query.assert_not_called()
@@ -0,0 +1,159 @@
+from unittest.mock import ANY, AsyncMock, patch
+
+from django.core.files.storage import default_storage
+
+from ...core import JobStatus
+from ..gemini_client import GEMINI_TIMEOUT_MESSAGE, IDENTIFY_ERROR_PREFIX
+from ..tasks import identify_hardware_task, update_product_embeddings_task
+
+
+@patch("saleor.hardware.tasks.get_client")
+def test_identify_hardware_task(mocked_get_client, hardware_identification):
+    # given
+    image_contents = []
+
+    def identify_hardware_from_image(image_path, image_digest):
+        with open(image_path, "rb") as f:
+            image_contents.append(f.read())
+        return "Intel Core i9-10900K"
+
+    identify_mock = AsyncMock(side_effect=identify_hardware_from_image)
+    mocked_get_client.return_value.identify_hardware_from_image = identify_mock
+
+    # when
+    identify_hardware_task(hardware_identification.pk, "digest")
+
+    # then
+    hardware_identification.refresh_from_db()
+    assert hardware_identification.status == JobStatus.SUCCESS
+    assert hardware_identification.result == "Intel Core i9-10900K"
+    identify_mock.assert_awaited_once_with(ANY, "digest")
+    assert identify_mock.await_args.args[0].endswith(".jpg")
+    assert image_contents == [b"image-data"]
+
+
+@patch("saleor.hardware.tasks.get_client")
+def test_identify_hardware_task_gemini_error(
+    mocked_get_client, hardware_identification
+):
+    # given
+    error_result = f"{IDENTIFY_ERROR_PREFIX}: Invalid image"
+    mocked_get_client.return_value.identify_hardware_from_image = AsyncMock(
+        return_value=error_result
+    )
+
+    # when
+    identify_hardware_task(hardware_identification.pk)
+
+    # then
+    hardware_identification.refresh_from_db()
+    assert hardware_identification.status == JobStatus.FAILED
+    assert hardware_identification.result == error_result
+
+
+@patch("saleor.hardware.tasks.run_sync", side_effect=TimeoutError)
+@patch("saleor.hardware.tasks.get_client")
+def test_identify_hardware_task_timeout(
+    mocked_get_client, mocked_run_sync, hardware_identification
+):
+    # when
+    identify_hardware_task(hardware_identification.pk)
+
+    # then
+    hardware_identification.refresh_from_db()
+    assert hardware_identification.status == JobStatus.FAILED
+    assert hardware_identification.result == (
+        f"{IDENTIFY_ERROR_PREFIX}: {GEMINI_TIMEOUT_MESSAGE}"
+    )
+
+
+@patch("saleor.hardware.tasks.get_client")
+def test_identify_hardware_task_missing_image(
+    mocked_get_client, hardware_identification
+):
+    # given
+    default_storage.delete(hardware_identification.image.name)
+
+    # when
+    identify_hardware_task(hardware_identification.pk)
+
+    # then
+    hardware_identification.refresh_from_db()
+    assert hardware_identification.status == JobStatus.FAILED
+    assert hardware_identification.result.startswith(IDENTIFY_ERROR_PREFIX)
+
+
+@patch("saleor.hardware.tasks.get_client")
+def test_identify_hardware_task_missing_identification(mocked_get_client, db):
+    # when
+    identify_hardware_task(-1)
+
+    # then
+    mocked_get_client.assert_not_called()
+
+
+@patch("saleor.hardware.tasks.update_product_embeddings_task.delay")
+@patch("saleor.hardware.tasks.update_product_embeddings")
+def test_update_product_embeddings_task(
+    mocked_update_embeddings, mocked_delay, product_list, settings
+):
+    # given
+    settings.GEMINI_API_KEY = "test-key"
+
+    # when
+    update_product_embeddings_task()
+
+    # then
+    mocked_update_embeddings.assert_called_once_with(
+        [product.pk for product in product_list]
+    )
+    mocked_delay.assert_not_called()
+
+
+@patch("saleor.hardware.tasks.PRODUCT_EMBEDDING_BATCH_SIZE", 2)
+@patch("saleor.hardware.tasks.update_product_embeddings_task.delay")
+@patch("saleor.hardware.tasks.update_product_embeddings")
+def test_update_product_embeddings_task_full_batch(
+    mocked_update_embeddings, mocked_delay, product_list, settings
+):
+    # given
+    settings.GEMINI_API_KEY = "test-key"
+
+    # when
+    update_product_embeddings_task()
+
+    # then
+    mocked_update_embeddings.assert_called_once_with(
+        [product.pk for product in product_list[:2]]
+    )
+    mocked_delay.assert_called_once_with()
+
+
+@patch("saleor.hardware.tasks.update_product_embeddings_task.delay")
+@patch("saleor.hardware.tasks.update_product_embeddings")
+def test_update_product_embeddings_task_up_to_date(
+    mocked_update_embeddings, mocked_delay, product_embeddings, settings
+):
+    # given
+    settings.GEMINI_API_KEY = "test-key"
+
+    # when
+    update_product_embeddings_task()
+
+    # then
+    mocked_update_embeddings.assert_not_called()
+    mocked_delay.assert_not_called()
+
+
+@patch("saleor.hardware.tasks.update_product_embeddings")
+def test_update_product_embeddings_task_no_api_key(
+    mocked_update_embeddings, product_list, settings
+):
+    # given
+    settings.GEMINI_API_KEY = ""
+
+    # when
+    update_product_embeddings_task()
+
+    # then
+    mocked_update_embeddings.assert_not_called()
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from ..utils import (
+    STORED_FILE_DIGEST_LENGTH,
+    get_uploaded_file_digest,
+    save_uploaded_image,
+)
+
+
+def test_save_uploaded_image(media_root):
+    # given
+    image_file = SimpleUploadedFile("image.jpg", b"image-data", "image/jpeg")
+    expected_digest = get_uploaded_file_digest(image_file)
+
+    # when
+    path, full_path, digest = save_uploaded_image(image_file, "hw")
+
+    # then
+    assert digest == expected_digest
+    assert path == f"hw/{digest[:STORED_FILE_DIGEST_LENGTH]}.jpg"
+    assert full_path == default_storage.path(path)
+    with open(full_path, "rb") as f:
+        assert f.read() == b"image-data"
+
+
+def test_save_uploaded_image_same_content_is_stored_once(media_root):
+    # given
+    first_file = SimpleUploadedFile("first.jpg", b"image-data", "image/jpeg")
+    second_file = SimpleUploadedFile("second.jpg", b"image-data", "image/jpeg")
+    first_path, _, first_digest = save_uploaded_image(first_file, "hw")
+
+    # when
+    with patch.object(
+        default_storage, "save", wraps=default_storage.save
+    ) as mocked_save:
+        second_path, _, second_digest = save_uploaded_image(second_file, "hw")
+
+    # then
+    assert second_path == first_path
+    assert second_digest == first_digest
+    mocked_save.assert_not_called()
+
+
+def test_save_uploaded_image_lowercases_extension(media_root):
+    # given
+    image_file = SimpleUploadedFile("IMAGE.JPG", b"image-data", "image/jpeg")
+
+    # when
+    path, _, digest = save_uploaded_image(image_file, "hw")
+
+    # then
+    assert path == f"hw/{digest[:STORED_FILE_DIGEST_LENGTH]}.jpg"
@@ -0,0 +1,65 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from blake3 import blake3
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+
+# Length of the digest prefix used in stored file names.
+STORED_FILE_DIGEST_LENGTH = 32
+
+
+# Image digests use BLAKE3, which is several times faster than SHA-256 on
+# multi-megabyte uploads.
+def get_file_digest(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, blake3).hexdigest()
+
+
+def get_uploaded_file_digest(uploaded_file: UploadedFile) -> str:
+    file_hash = blake3()
+    for chunk in uploaded_file.chunks():
+        file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def save_uploaded_image(
+    image_file: UploadedFile, directory: str
+) -> tuple[str, str, str]:
+    """Save an uploaded image and return its storage name, local path and digest.
+
+    Images are stored under a name derived from their content, so an image that
+    was uploaded before is not written again. The file system storage moves
+    temporary uploads into place instead of copying them, and writes in-memory
+    uploads chunk by chunk.
+    """
+    digest = get_uploaded_file_digest(image_file)
+    _, extension = os.path.splitext(image_file.name or "")
+    name = f"{directory}/{digest[:STORED_FILE_DIGEST_LENGTH]}{extension.lower()}"
+    if default_storage.exists(name):
+        path = name
+    else:
+        path = default_storage.save(name, image_file)
+    return path, default_storage.path(path), digest
+
+
+@contextmanager
+def stored_file_local_copy(name: str) -> Iterator[str]:
+    """Copy a file from the default storage to a temporary file and yield its path.
+
+    Celery workers do not necessarily share the media directory of the web
+    process, so tasks read stored files through the storage. The copy keeps the
+    extension of the stored name, which is used to guess its MIME type.
+    """
+    _, extension = os.path.splitext(name)
+    with (
+        default_storage.open(name, "rb") as stored_file,
+        tempfile.NamedTemporaryFile(suffix=extension) as local_file,
+    ):
+        shutil.copyfileobj(stored_file, local_file)
+        local_file.flush()
+        yield local_file.name
@@ -657,6 +657,11 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": datetime.timedelta(seconds=BEAT_UPDATE_SEARCH_SEC),
         "options": {"expires": BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC},
     },
+    "update-product-embeddings": {
+        "task": "saleor.hardware.tasks.update_product_embeddings_task",
+        "schedule": datetime.timedelta(minutes=5),
+        "options": {"expires": 5 * 60},
+    },
     "update-gift-cards-search-vectors": {
         "task": "saleor.giftcard.tasks.update_gift_cards_search_vector_task",
         "schedule": datetime.timedelta(seconds=BEAT_UPDATE_SEARCH_SEC),